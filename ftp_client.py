@@ -5,22 +5,194 @@ Built for educational purposes to test FTP server and observe unencrypted transf
 """
 
 import os
+import ssl
 import sys
 import cmd
+import mmap
+import stat
+import shlex
 import ftplib
+import socket
 import argparse
 from datetime import datetime
 from dotenv import load_dotenv
 
+# Socket buffer size for control/data connections (bytes)
+# Large buffers give TCP window scaling headroom on high-latency links
+DEFAULT_SOCK_BUF = 4 * 1024 * 1024
+
+# Files at least this large are memory-mapped for upload when the
+# sendfile path is unavailable, avoiding a fresh bytes object per block
+MMAP_THRESHOLD = 16 * 1024 * 1024
+
+
+_env_loaded = False
+
+
+def load_env():
+    """Load connection settings from dotenv files exactly once
+
+    Short-lived CLI invocations (e.g. `python ftp_client.py ls`) were
+    parsing a dotenv file on every run, and the interactive shell and
+    command mode each loaded a different file. Prefer a local .env and
+    fall back to the checked-in .env.development; load_dotenv never
+    overrides values that are already set.
+    """
+
+    global _env_loaded
+    if _env_loaded:
+        return
+    load_dotenv('.env')
+    load_dotenv('.env.development')
+    _env_loaded = True
+
+
+def get_socket_buffer_size():
+    """Read socket buffer size from FTP_SOCK_BUF env var (default 4 MB)"""
+
+    try:
+        return int(os.getenv('FTP_SOCK_BUF', DEFAULT_SOCK_BUF))
+    except ValueError:
+        return DEFAULT_SOCK_BUF
+
+
+def tune_socket(sock):
+    """Raise SO_SNDBUF/SO_RCVBUF on a socket for better bulk throughput"""
+
+    buf_size = get_socket_buffer_size()
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, buf_size)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, buf_size)
+        # Disable Nagle so short command/response pairs aren't delayed
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if hasattr(socket, 'TCP_QUICKACK'):  # Linux only
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+    except OSError:
+        pass  # Keep kernel defaults if the platform rejects the size
+
+
+class _MmapReader:
+    """Wrap an mmap object with the readinto method it lacks
+
+    mmap exposes the buffer protocol but no readinto, so handing it to
+    TunedFTP.storbinary directly would fall back to fp.read() and
+    allocate a fresh bytes object per block — the very churn the mmap
+    path exists to avoid. readinto copies straight from a memoryview
+    over the mapping into the caller's reused buffer. Call close()
+    before closing the mapping; mmap refuses to close while the view
+    is still exported.
+    """
+
+    def __init__(self, mapped):
+        self._view = memoryview(mapped)
+        self._pos = 0
+
+    def readinto(self, buf):
+        remaining = len(self._view) - self._pos
+        count = min(len(buf), remaining)
+        buf[:count] = self._view[self._pos:self._pos + count]
+        self._pos += count
+        return count
+
+    def close(self):
+        self._view.release()
+
+
+class TunedFTP(ftplib.FTP):
+    """ftplib.FTP subclass that enlarges socket buffers on data connections"""
+
+    def ntransfercmd(self, cmd, rest=None):
+        """Open a data connection with tuned socket buffers"""
+
+        conn, size = super().ntransfercmd(cmd, rest)
+        tune_socket(conn)
+        return conn, size
+
+    def storbinary(self, cmd, fp, blocksize=8192, callback=None, rest=None):
+        """storbinary with a single reused transfer buffer
+
+        ftplib's implementation allocates a fresh bytes object per block
+        via fp.read(); reading into one preallocated bytearray and
+        sending a memoryview slice keeps a whole transfer at O(1)
+        allocations. Sources without readinto fall back to the stock
+        implementation.
+        """
+
+        if not hasattr(fp, 'readinto'):
+            return super().storbinary(cmd, fp, blocksize, callback, rest)
+
+        self.voidcmd('TYPE I')
+        buf = bytearray(blocksize)
+        view = memoryview(buf)
+        with self.transfercmd(cmd, rest) as conn:
+            while True:
+                read = fp.readinto(buf)
+                if not read:
+                    break
+                conn.sendall(view[:read])
+                if callback:
+                    callback(view[:read])
+            if isinstance(conn, ssl.SSLSocket):
+                conn.unwrap()  # Graceful close_notify, as ftplib does
+        return self.voidresp()
+
+    def retrbinary(self, cmd, callback, blocksize=8192, rest=None):
+        """retrbinary that receives into a single reused buffer
+
+        Uses recv_into on a preallocated bytearray and hands the
+        callback a memoryview slice (binary file.write accepts it
+        directly), avoiding a bytes allocation per block.
+        """
+
+        self.voidcmd('TYPE I')
+        buf = bytearray(blocksize)
+        view = memoryview(buf)
+        with self.transfercmd(cmd, rest) as conn:
+            while True:
+                received = conn.recv_into(buf)
+                if not received:
+                    break
+                callback(view[:received])
+            if isinstance(conn, ssl.SSLSocket):
+                conn.unwrap()  # Graceful close_notify, as ftplib does
+        return self.voidresp()
+
+    def storbinary_sendfile(self, cmd, fileobj):
+        """Store a file using os.sendfile for a zero-copy upload path
+
+        Hands the file descriptor straight to the kernel so file bytes
+        never pass through Python, avoiding the per-block read/send
+        copy loop of storbinary. Only valid for regular files on
+        platforms that provide os.sendfile.
+        """
+
+        self.voidcmd('TYPE I')
+        with self.transfercmd(cmd) as conn:
+            offset = 0
+            while True:
+                sent = os.sendfile(conn.fileno(), fileobj.fileno(),
+                                   offset, 1 << 20)
+                if sent == 0:
+                    break
+                offset += sent
+        return self.voidresp()
+
+
+class TunedFTPTLS(TunedFTP, ftplib.FTP_TLS):
+    """FTPS variant of TunedFTP; data connections are TLS-wrapped"""
+
 
 class FTPClient:
     """FTP Client class for connecting and performing operations"""
 
-    def __init__(self, host='127.0.0.1', port=2121, username='labuser', password='labpass123'):
+    def __init__(self, host='127.0.0.1', port=2121, username='labuser', password='labpass123',
+                 block_size=256 * 1024, use_tls=False):
         self.host = host
         self.port = port
         self.username = username
         self.password = password
+        self.block_size = block_size
+        self.use_tls = use_tls
         self.ftp = None
         self.connected = False
 
@@ -29,12 +201,23 @@ class FTPClient:
 
         try:
             print(f"Connecting to FTP server {self.host}:{self.port}...")
-            self.ftp = ftplib.FTP()
+            # latin-1 maps bytes 1:1 to code points, so control-channel
+            # lines skip UTF-8 validation and can never fail to decode
+            ftp_class = TunedFTPTLS if self.use_tls else TunedFTP
+            self.ftp = ftp_class(encoding='latin-1')
+            self.ftp.maxline = 65536  # Larger control-channel reads
             self.ftp.connect(self.host, self.port)
+            tune_socket(self.ftp.sock)
 
             print(f"Logging in as user: {self.username}")
             self.ftp.login(self.username, self.password)
 
+            if self.use_tls:
+                # Encrypt the data channel too; OpenSSL uses AES-NI
+                # where available so the crypto cost is minimal
+                self.ftp.prot_p()
+                print("TLS enabled for control and data channels")
+
             self.connected = True
             welcome_msg = self.ftp.getwelcome()
             print(f"Connected successfully!")
@@ -66,10 +249,6 @@ class FTPClient:
             print("Error: Not connected to FTP server")
             return False
 
-        if not os.path.exists(local_path):
-            print(f"Error: Local file '{local_path}' not found")
-            return False
-
         # Default to basename if no remote path specified
         if remote_path is None:
             remote_path = os.path.basename(local_path)
@@ -78,11 +257,38 @@ class FTPClient:
             print(f"Uploading '{local_path}' to '{remote_path}'...")
 
             with open(local_path, 'rb') as file:
-                self.ftp.storbinary(f'STOR {remote_path}', file)
+                # Zero-copy path for regular files where the OS supports
+                # it; not valid when the data connection is TLS-wrapped
+                file_stat = os.fstat(file.fileno())
+                if (hasattr(os, 'sendfile') and not self.use_tls
+                        and stat.S_ISREG(file_stat.st_mode)):
+                    self.ftp.storbinary_sendfile(f'STOR {remote_path}', file)
+                elif (stat.S_ISREG(file_stat.st_mode)
+                        and file_stat.st_size >= MMAP_THRESHOLD):
+                    # Memory-map big files; the readinto wrapper lets
+                    # storbinary copy page-cache slices into its one
+                    # reused buffer instead of allocating per block
+                    with mmap.mmap(file.fileno(), 0,
+                                   access=mmap.ACCESS_READ) as mapped:
+                        reader = _MmapReader(mapped)
+                        try:
+                            self.ftp.storbinary(f'STOR {remote_path}',
+                                                reader,
+                                                blocksize=self.block_size)
+                        finally:
+                            reader.close()
+                else:
+                    self.ftp.storbinary(f'STOR {remote_path}', file,
+                                        blocksize=self.block_size)
 
             print(f"Upload successful: {local_path} -> {remote_path}")
             return True
 
+        except FileNotFoundError:
+            # EAFP: let open() report a missing file instead of paying a
+            # separate exists() stat before every upload
+            print(f"Error: Local file '{local_path}' not found")
+            return False
         except ftplib.all_errors as e:
             print(f"Upload failed: {e}")
             return False
@@ -102,7 +308,8 @@ class FTPClient:
             print(f"Downloading '{remote_path}' to '{local_path}'...")
 
             with open(local_path, 'wb') as file:
-                self.ftp.retrbinary(f'RETR {remote_path}', file.write)
+                self.ftp.retrbinary(f'RETR {remote_path}', file.write,
+                                    blocksize=self.block_size)
 
             print(f"Download successful: {remote_path} -> {local_path}")
             return True
@@ -111,6 +318,38 @@ class FTPClient:
             print(f"Download failed: {e}")
             return False
 
+    def upload_many(self, local_paths):
+        """Upload several files over the existing session
+
+        Reuses the single logged-in connection so the TCP and USER/PASS
+        handshake is paid once for the whole batch instead of per file.
+        Returns the number of successful uploads.
+        """
+
+        success_count = 0
+        for local_path in local_paths:
+            if self.upload_file(local_path):
+                success_count += 1
+
+        print(f"Batch upload complete: {success_count}/{len(local_paths)} files")
+        return success_count
+
+    def download_many(self, remote_paths):
+        """Download several files over the existing session
+
+        Reuses the single logged-in connection so the connection setup
+        cost is amortized across the batch. Returns the number of
+        successful downloads.
+        """
+
+        success_count = 0
+        for remote_path in remote_paths:
+            if self.download_file(remote_path):
+                success_count += 1
+
+        print(f"Batch download complete: {success_count}/{len(remote_paths)} files")
+        return success_count
+
     def list_files(self, path='.'):
         """List files in the specified directory"""
         if not self.connected:
@@ -121,11 +360,9 @@ class FTPClient:
             print(f"Directory listing for: {path}")
             print("-" * 40)
 
-            files = []
-            self.ftp.dir(path, files.append)  # Callback to collect output
-
-            for file in files:
-                print(file)
+            # Print each entry as it arrives instead of buffering the
+            # whole listing; keeps memory flat on huge directories
+            self.ftp.dir(path, print)
 
         except ftplib.all_errors as e:
             print(f"List failed: {e}")
@@ -176,98 +413,136 @@ class FTPInteractiveShell(cmd.Cmd):
 
     def __init__(self):
         super().__init__()
-        load_dotenv('.env')
+        load_env()
 
         # Load configuration from environment
         self.host = os.getenv('FTP_HOST', '127.0.0.1')
         self.port = int(os.getenv('FTP_PORT', '2121'))
         self.username = os.getenv('FTP_USER', 'labuser')
         self.password = os.getenv('FTP_PASSWORD', 'labpass123')
+        # Cleartext FTP stays the lab default; opt in to FTPS via env
+        self.use_tls = os.getenv('FTP_TLS', '').lower() in ('1', 'true', 'yes')
 
         self.client = FTPClient(self.host, self.port,
-                                self.username, self.password)
+                                self.username, self.password,
+                                use_tls=self.use_tls)
+
+        # Command table built once; onecmd dispatches through it instead
+        # of cmd.Cmd's per-line attribute lookup
+        self._dispatch = {
+            'connect': self.do_connect,
+            'disconnect': self.do_disconnect,
+            'upload': self.do_upload,
+            'download': self.do_download,
+            'mput': self.do_mput,
+            'mget': self.do_mget,
+            'ls': self.do_ls,
+            'dir': self.do_dir,
+            'pwd': self.do_pwd,
+            'cd': self.do_cd,
+            'stats': self.do_stats,
+            'status': self.do_status,
+            'quit': self.do_quit,
+            'exit': self.do_exit,
+            'EOF': self.do_EOF,
+            'help': lambda argv: self.do_help(' '.join(argv)),
+            '?': lambda argv: self.do_help(' '.join(argv)),
+        }
 
         # Auto-connect on startup and update prompt
         if self.client.connect():
             self.prompt = f'FTP({self.host})> '
 
-    def do_connect(self, args):
+    def do_connect(self, argv):
         """Connect to FTP server: connect [host] [port] [username] [password]"""
 
-        parts = args.split()
-
         # Override defaults with command line arguments
-        if len(parts) >= 1:
-            self.host = parts[0]
-        if len(parts) >= 2:
-            self.port = int(parts[1])
-        if len(parts) >= 3:
-            self.username = parts[2]
-        if len(parts) >= 4:
-            self.password = parts[3]
+        if len(argv) >= 1:
+            self.host = argv[0]
+        if len(argv) >= 2:
+            self.port = int(argv[1])
+        if len(argv) >= 3:
+            self.username = argv[2]
+        if len(argv) >= 4:
+            self.password = argv[3]
 
         self.client = FTPClient(self.host, self.port,
-                                self.username, self.password)
+                                self.username, self.password,
+                                use_tls=self.use_tls)
         if self.client.connect():
             self.prompt = f'FTP({self.host})> '
 
-    def do_disconnect(self, args):
+    def do_disconnect(self, argv):
         """Disconnect from FTP server"""
 
         self.client.disconnect()
         self.prompt = 'FTP> '
 
-    def do_upload(self, args):
+    def do_upload(self, argv):
         """Upload a file: upload <local_file> [remote_file]"""
 
-        parts = args.split()
-        if len(parts) < 1:
+        if len(argv) < 1:
             print("Usage: upload <local_file> [remote_file]")
             return
 
-        local_file = parts[0]
-        remote_file = parts[1] if len(parts) > 1 else None
+        local_file = argv[0]
+        remote_file = argv[1] if len(argv) > 1 else None
         self.client.upload_file(local_file, remote_file)
 
-    def do_download(self, args):
+    def do_download(self, argv):
         """Download a file: download <remote_file> [local_file]"""
 
-        parts = args.split()
-        if len(parts) < 1:
+        if len(argv) < 1:
             print("Usage: download <remote_file> [local_file]")
             return
 
-        remote_file = parts[0]
-        local_file = parts[1] if len(parts) > 1 else None
+        remote_file = argv[0]
+        local_file = argv[1] if len(argv) > 1 else None
         self.client.download_file(remote_file, local_file)
 
-    def do_ls(self, args):
+    def do_mput(self, argv):
+        """Upload multiple files over one session: mput <file> [file ...]"""
+
+        if len(argv) < 1:
+            print("Usage: mput <file> [file ...]")
+            return
+        self.client.upload_many(argv)
+
+    def do_mget(self, argv):
+        """Download multiple files over one session: mget <file> [file ...]"""
+
+        if len(argv) < 1:
+            print("Usage: mget <file> [file ...]")
+            return
+        self.client.download_many(argv)
+
+    def do_ls(self, argv):
         """List files: ls [directory]"""
 
-        path = args.strip() or '.'
+        path = argv[0] if argv else '.'
         self.client.list_files(path)
 
-    def do_dir(self, args):
+    def do_dir(self, argv):
         """List files (alias for ls): dir [directory]"""
 
-        self.do_ls(args)
+        self.do_ls(argv)
 
-    def do_pwd(self, args):
+    def do_pwd(self, argv):
         """Show current directory: pwd"""
 
         current_dir = self.client.get_current_directory()
         if current_dir:
             print(f"Current directory: {current_dir}")
 
-    def do_cd(self, args):
+    def do_cd(self, argv):
         """Change directory: cd <directory>"""
 
-        if not args.strip():
+        if len(argv) < 1:
             print("Usage: cd <directory>")
             return
-        self.client.change_directory(args.strip())
+        self.client.change_directory(argv[0])
 
-    def do_stats(self, args):
+    def do_stats(self, argv):
         """Show connection statistics and server info"""
 
         if not self.client.connected:
@@ -286,24 +561,24 @@ class FTPInteractiveShell(cmd.Cmd):
         except:
             print("Server Status: Not available")
 
-    def do_status(self, args):
+    def do_status(self, argv):
         """Show connection status (alias for stats)"""
 
-        self.do_stats(args)
+        self.do_stats(argv)
 
-    def do_quit(self, args):
+    def do_quit(self, argv):
         """Quit the FTP client: quit"""
 
         print("Goodbye!")
         self.client.disconnect()
         return True
 
-    def do_exit(self, args):
+    def do_exit(self, argv):
         """Exit the FTP client (alias for quit): exit"""
 
-        return self.do_quit(args)
+        return self.do_quit(argv)
 
-    def do_EOF(self, args):
+    def do_EOF(self, argv):
         """Handle Ctrl+D"""
 
         print("\nGoodbye!")
@@ -311,10 +586,24 @@ class FTPInteractiveShell(cmd.Cmd):
         return True
 
     def onecmd(self, line):
-        """Override to handle errors gracefully"""
+        """Dispatch through the command table with shlex parsing
+
+        shlex.split keeps quoted paths with spaces intact (args.split()
+        used to break them), and the dict lookup replaces cmd.Cmd's
+        per-line attribute lookup and string munging. Errors are caught
+        so a bad command never kills the shell.
+        """
 
         try:
-            return super().onecmd(line)
+            parts = shlex.split(line)
+            if not parts:
+                return False
+
+            handler = self._dispatch.get(parts[0])
+            if handler is None:
+                self.default(line)
+                return False
+            return handler(parts[1:])
         except Exception as e:
             print(f"Error executing command: {e}")
             return False
@@ -333,6 +622,8 @@ Usage:
     Command mode:
         python ftp_client.py upload <local_file> [remote_file]
         python ftp_client.py download <remote_file> [local_file]
+        python ftp_client.py mput <file> [file ...]
+        python ftp_client.py mget <file> [file ...]
         python ftp_client.py ls [directory]
         python ftp_client.py connect [host] [port] [username] [password]
 
@@ -376,6 +667,8 @@ def main():
                             default=None, help='FTP server port')
         parser.add_argument('--user', default=None, help='FTP username')
         parser.add_argument('--password', default=None, help='FTP password')
+        parser.add_argument('--tls', action='store_true',
+                            help='Use FTPS (TLS) for control and data channels')
 
         # Handle help requests before parsing
         if '--help' in sys.argv or '-h' in sys.argv:
@@ -385,7 +678,7 @@ def main():
         args = parser.parse_args()
 
         # Load environment variables
-        load_dotenv('.env.development')
+        load_env()
 
         # Command line args override environment variables
         host = args.host or os.getenv('FTP_HOST', '127.0.0.1')
@@ -393,8 +686,9 @@ def main():
         username = args.user or os.getenv('FTP_USER', 'labuser')
         password = args.password or os.getenv('FTP_PASSWORD', 'labpass123')
 
-        # Create client and connect
-        client = FTPClient(host, port, username, password)
+        # Create client and connect (cleartext lab default; --tls opts in)
+        client = FTPClient(host, port, username, password,
+                           use_tls=args.tls)
 
         try:
             if not client.connect():
@@ -421,6 +715,20 @@ def main():
                 success = client.download_file(remote_file, local_file)
                 sys.exit(0 if success else 1)
 
+            elif command == 'mput':
+                if len(args.args) < 1:
+                    print("Usage: mput <file> [file ...]")
+                    sys.exit(1)
+                success_count = client.upload_many(args.args)
+                sys.exit(0 if success_count == len(args.args) else 1)
+
+            elif command == 'mget':
+                if len(args.args) < 1:
+                    print("Usage: mget <file> [file ...]")
+                    sys.exit(1)
+                success_count = client.download_many(args.args)
+                sys.exit(0 if success_count == len(args.args) else 1)
+
             elif command == 'ls' or command == 'list':
                 path = args.args[0] if len(args.args) > 0 else '.'
                 client.list_files(path)
@@ -9,14 +9,200 @@ in cybersecurity training environments. Logs all commands and file transfers.
 
 import os
 import sys
+import time
+import atexit
+import signal
+import queue
+import random
+import socket
 import logging
+import logging.handlers
+import threading
+import collections
+from dataclasses import dataclass
 from datetime import datetime
 
 from pyftpdlib.authorizers import DummyAuthorizer
-from pyftpdlib.handlers import FTPHandler
-from pyftpdlib.servers import FTPServer
+from pyftpdlib.handlers import FTPHandler, DTPHandler
+from pyftpdlib.servers import ThreadedFTPServer
 from dotenv import load_dotenv
 
+try:
+    import resource
+except ImportError:
+    resource = None  # Windows
+
+
+def raise_fd_limit():
+    """Raise the open-file soft limit toward the hard limit (POSIX only)
+
+    Every session holds a control socket plus a data socket and file
+    descriptor during transfers, so the common 1024 soft limit caps
+    concurrency well below max_cons under load.
+    """
+
+    if resource is None:
+        return
+    try:
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        target = hard if hard != resource.RLIM_INFINITY else 65536
+        if soft < target:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+    except (ValueError, OSError):
+        pass  # Keep the inherited limit if the kernel refuses
+
+# Module-level logger so hot handler callbacks skip repeated getLogger lookups
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class ServerConfig:
+    """Server settings resolved from the environment exactly once
+
+    Field defaults double as the lab-appropriate fallbacks; downstream
+    code reads the config object instead of re-querying os.getenv.
+    """
+
+    user: str = 'labuser'
+    password: str = 'labpass123'
+    host: str = '127.0.0.1'
+    port: int = 2121  # Non-standard port for lab isolation
+    server_root: str = 'ftp_server_root'
+    # Permission string: e=change dir, l=list, r=read, a=append, d=delete, f=rename, m=mkdir, w=write, M=chmod, T=time
+    permissions: str = 'elradfmwMT'
+
+    @classmethod
+    def from_env(cls) -> 'ServerConfig':
+        """Build the config from environment variables in one pass"""
+
+        env = os.environ
+        return cls(
+            user=env.get('FTP_USER', cls.user),
+            password=env.get('FTP_PASSWORD', cls.password),
+            host=env.get('FTP_HOST', cls.host),
+            port=int(env.get('FTP_PORT', cls.port)),
+            server_root=env.get('FTP_SERVER_ROOT', cls.server_root),
+            permissions=env.get('FTP_PERMISSIONS', cls.permissions),
+        )
+
+
+# Upload events are coalesced so a burst of many small STORs doesn't
+# take the logging lock once per file; flushed every N events and on
+# client disconnect
+UPLOAD_LOG_BATCH = 32
+_upload_events = collections.deque()
+_upload_events_lock = threading.Lock()
+
+
+def flush_upload_events():
+    """Emit any buffered upload events as a single log record"""
+
+    with _upload_events_lock:
+        events = list(_upload_events)
+        _upload_events.clear()
+    if events:
+        logger.info("[UPLOAD] %d file(s) uploaded:\n%s",
+                    len(events), "\n".join(events))
+
+
+# Raw descriptor for the session log file, opened O_APPEND in
+# setup_logging; used by the hottest command hooks
+_log_fd = None
+
+
+def fast_log(message):
+    """Append one preformatted line to the log file with a raw write
+
+    Bypasses the logging machinery for high-frequency command hooks:
+    os.write on an O_APPEND descriptor is a single syscall, atomic for
+    lines this short, and takes no Python-level lock.
+    """
+
+    if _log_fd is not None:
+        os.write(_log_fd, f"{now_str()} - INFO - {message}\n".encode())
+
+
+def now_str():
+    """Current wall-clock time for console banners
+
+    time.strftime is a direct C call, several times cheaper than going
+    through a datetime object for the same string.
+    """
+
+    return time.strftime('%Y-%m-%d %H:%M:%S')
+
+
+class PerSecondFormatter(logging.Formatter):
+    """Formatter that reuses the rendered timestamp within one second
+
+    The log timestamp has one-second resolution, so under heavy command
+    load most records in a burst would re-run strftime just to produce
+    the identical string. Cache the result keyed on the integer second;
+    records are formatted on the single queue-listener thread, so no
+    locking is needed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._last_sec = None
+        self._last_str = ''
+
+    def formatTime(self, record, datefmt=None):
+        sec = int(record.created)
+        if sec != self._last_sec:
+            self._last_str = super().formatTime(record, datefmt)
+            self._last_sec = sec
+        return self._last_str
+
+
+class BufferedConsoleHandler(logging.StreamHandler):
+    """StreamHandler without the per-record flush
+
+    logging.StreamHandler flushes the stream after every record, which
+    costs a write syscall per event once stdout is redirected to a file
+    or pipe. Console output is informational here, so let the stream's
+    own block buffering decide when to write; close() still performs a
+    real flush so nothing is lost at shutdown.
+    """
+
+    def flush(self):
+        pass
+
+    def close(self):
+        logging.StreamHandler.flush(self)
+        super().close()
+
+
+def disable_nagle(sock):
+    """Disable Nagle coalescing (and delayed ACKs where supported)
+
+    Short FTP command/response exchanges otherwise pay up to ~40 ms of
+    Nagle plus delayed-ACK latency per round trip on WAN links.
+    """
+
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if hasattr(socket, 'TCP_QUICKACK'):  # Linux only
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+    except OSError:
+        pass  # Not fatal; keep default socket behavior
+
+
+class LowLatencyDTPHandler(DTPHandler):
+    """Data channel handler tuned for throughput and low latency"""
+
+    # Pin the 64 KB I/O buffers explicitly. Current pyftpdlib already
+    # defaults to 65536 for both, so this is insurance against a
+    # library default change rather than a tuning win today. The out
+    # buffer is only consulted when the sendfile path is off (e.g.
+    # ASCII mode), so both directions stay covered either way.
+    ac_in_buffer_size = 65536
+    ac_out_buffer_size = 65536
+
+    def __init__(self, sock, cmd_channel):
+        super().__init__(sock, cmd_channel)
+        if self.socket is not None:
+            disable_nagle(self.socket)
+
 
 class CustomFTPHandler(FTPHandler):
     """
@@ -27,26 +213,28 @@ class CustomFTPHandler(FTPHandler):
     Provides real-time console output alongside file logging.
     """
 
+    # Use the low-latency data channel for transfers
+    dtp_handler = LowLatencyDTPHandler
+
     def on_connect(self):
         """Log client connections with IP and port information"""
 
-        logging.info(
-            f"[CONNECTION] Client connected from {self.remote_ip}:{self.remote_port}")
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] CLIENT CONNECTED: {self.remote_ip}:{self.remote_port}")
+        disable_nagle(self.socket)
+        logger.info("[CONNECTION] Client connected from %s:%s",
+                    self.remote_ip, self.remote_port)
 
     def on_disconnect(self):
         """Log client disconnections for session tracking"""
 
-        logging.info(
-            f"[DISCONNECTION] Client {self.remote_ip}:{self.remote_port} disconnected")
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] CLIENT DISCONNECTED: {self.remote_ip}:{self.remote_port}")
+        flush_upload_events()
+        logger.info("[DISCONNECTION] Client %s:%s disconnected",
+                    self.remote_ip, self.remote_port)
 
     def on_login(self, username):
         """Log successful authentication events"""
 
-        logging.info(
-            f"[LOGIN] User '{username}' logged in from {self.remote_ip}")
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] LOGIN SUCCESS: User '{username}' from {self.remote_ip}")
+        logger.info("[LOGIN] User '%s' logged in from %s",
+                    username, self.remote_ip)
 
     def on_login_failed(self, username, password):
         """
@@ -56,57 +244,50 @@ class CustomFTPHandler(FTPHandler):
         Never do this in production environments
         """
 
-        logging.warning(
-            f"[LOGIN FAILED] Failed login attempt - Username: '{username}', Password: '{password}' from {self.remote_ip}")
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] LOGIN FAILED: User '{username}' from {self.remote_ip}")
+        logger.warning(
+            "[LOGIN FAILED] Failed login attempt - Username: '%s', Password: '%s' from %s",
+            username, password, self.remote_ip)
 
     def on_logout(self, username):
         """Log user logout events for session completion tracking"""
 
-        logging.info(
-            f"[LOGOUT] User '{username}' logged out from {self.remote_ip}")
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] LOGOUT: User '{username}' from {self.remote_ip}")
+        logger.info("[LOGOUT] User '%s' logged out from %s",
+                    username, self.remote_ip)
 
     def on_file_sent(self, file):
         """Log file downloads (server -> client transfers)"""
 
-        logging.info(
-            f"[DOWNLOAD] File '{file}' downloaded by {self.username} from {self.remote_ip}")
-        print(
-            f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] FILE DOWNLOADED: '{file}' by {self.username}")
+        logger.info("[DOWNLOAD] File '%s' downloaded by %s from %s",
+                    file, self.username, self.remote_ip)
 
     def on_file_received(self, file):
-        """Log file uploads (client -> server transfers)"""
+        """Buffer file uploads (client -> server transfers) for batch logging"""
 
-        logging.info(
-            f"[UPLOAD] File '{file}' uploaded by {self.username} from {self.remote_ip}")
-        print(
-            f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] FILE UPLOADED: '{file}' by {self.username}")
+        with _upload_events_lock:
+            _upload_events.append(
+                f"File '{file}' uploaded by {self.username} from {self.remote_ip}")
+            should_flush = len(_upload_events) >= UPLOAD_LOG_BATCH
+        if should_flush:
+            flush_upload_events()
 
     def ftp_LIST(self, path):
         """Override LIST command to log directory listings"""
 
-        logging.info(
-            f"[COMMAND] LIST command executed by {self.username} for path: {path}")
-        print(
-            f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] COMMAND: LIST '{path}' by {self.username}")
+        fast_log(f"[COMMAND] LIST command executed by {self.username} "
+                 f"for path: {path}")
         return super().ftp_LIST(path)
 
     def ftp_PWD(self, line):
         """Override PWD command to log current directory requests"""
 
-        logging.info(f"[COMMAND] PWD command executed by {self.username}")
-        print(
-            f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] COMMAND: PWD by {self.username}")
+        fast_log(f"[COMMAND] PWD command executed by {self.username}")
         return super().ftp_PWD(line)
 
     def ftp_CWD(self, path):
         """Override CWD command to log directory changes"""
 
-        logging.info(
-            f"[COMMAND] CWD command executed by {self.username} to: {path}")
-        print(
-            f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] COMMAND: CWD '{path}' by {self.username}")
+        fast_log(f"[COMMAND] CWD command executed by {self.username} "
+                 f"to: {path}")
         return super().ftp_CWD(path)
 
 
@@ -117,6 +298,11 @@ def setup_logging():
     Creates logs directory if needed and generates unique log filename
     based on server start time for session tracking.
 
+    Log records are routed through a QueueHandler/QueueListener pair so
+    handler callbacks only pay a cheap queue.put; the actual file and
+    console writes happen on a background thread instead of stalling
+    the server loop on disk I/O.
+
     Returns:
         str: Path to created log file
     """
@@ -129,14 +315,61 @@ def setup_logging():
     log_filename = os.path.join(
         log_dir, f"ftp_server_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
 
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_filename),
-            logging.StreamHandler()  # Also log to console
-        ]
-    )
+    # Explicit datefmt skips the default asctime path, which formats the
+    # time twice (strftime plus millisecond suffix) per record; the
+    # formatter additionally memoizes the rendered time per second
+    formatter = PerSecondFormatter('%(asctime)s - %(levelname)s - %(message)s',
+                                   datefmt='%Y-%m-%d %H:%M:%S')
+
+    # Raw append descriptor shared by the fast_log hot path
+    global _log_fd
+    _log_fd = os.open(log_filename,
+                      os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    file_handler = logging.FileHandler(log_filename)
+    file_handler.setFormatter(formatter)
+
+    # Coalesce file writes: records accumulate in memory and hit the
+    # disk in batches of up to 512, immediately on anything ERROR or
+    # worse, and on close, instead of one write() per record
+    memory_handler = logging.handlers.MemoryHandler(
+        512, flushLevel=logging.ERROR, target=file_handler,
+        flushOnClose=True)
+    atexit.register(memory_handler.flush)
+
+    # atexit alone doesn't run on SIGTERM, the ordinary service stop,
+    # which would discard everything still buffered above. Route the
+    # signal through the same KeyboardInterrupt path as Ctrl+C so the
+    # server shuts down cleanly and the flush handlers run.
+    def handle_sigterm(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
+    console_handler = BufferedConsoleHandler()  # Also log to console
+    console_handler.setFormatter(formatter)
+
+    # Background thread drains the queue into both handlers
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(
+        log_queue, memory_handler, console_handler)
+    listener.start()
+    atexit.register(listener.stop)  # Flush pending records on shutdown
+
+    # Registered after listener.stop so LIFO ordering flushes any
+    # partial upload batch while the listener is still draining; the
+    # record would otherwise land in a queue nobody reads
+    atexit.register(flush_upload_events)
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    # pyftpdlib logs every command itself; with the custom hooks doing
+    # the interesting logging that would double-format and double-write
+    # each event, so keep the library logger to warnings and above
+    logging.getLogger('pyftpdlib').setLevel(logging.WARNING)
+
     return log_filename
 
 
@@ -154,22 +387,24 @@ def create_server_directory(server_root):
         str: Absolute path to server root directory
     """
 
-    if not os.path.exists(server_root):
-        os.makedirs(server_root)
-        print(f"Created FTP server directory: {server_root}")
-
-        # Create a sample subdirectory structure for testing
-        sample_dirs = ["uploads", "downloads", "shared"]
-        for dir_name in sample_dirs:
-            dir_path = os.path.join(server_root, dir_name)
-            os.makedirs(dir_path, exist_ok=True)
+    # exist_ok makes creation idempotent, so no separate existence probe
+    # is needed for the root or the sample subdirectory structure
+    os.makedirs(server_root, exist_ok=True)
+    for dir_name in ("uploads", "downloads", "shared"):
+        os.makedirs(os.path.join(server_root, dir_name), exist_ok=True)
 
-        # Create a sample file for testing downloads
-        sample_file = os.path.join(server_root, "welcome.txt")
-        with open(sample_file, 'w') as f:
-            f.write("Welcome to the FTP Server!\n")
-            f.write("This is a test file for cybersecurity lab purposes.\n")
-            f.write(f"Server started at: {datetime.now()}\n")
+    # Create a sample file for testing downloads on first run; 'x' mode
+    # (O_CREAT|O_EXCL) collapses the existence probe and the create into
+    # one atomic syscall, with no stat and no TOCTOU window
+    sample_file = os.path.join(server_root, "welcome.txt")
+    try:
+        with open(sample_file, 'x') as f:
+            f.write("Welcome to the FTP Server!\n"
+                    "This is a test file for cybersecurity lab purposes.\n"
+                    f"Server started at: {datetime.now()}\n")
+        print(f"Created FTP server directory: {server_root}")
+    except FileExistsError:
+        pass  # Not the first run; keep the existing sample file
 
     return os.path.abspath(server_root)
 
@@ -189,15 +424,14 @@ def main():
     # Initialize logging system
     log_file = setup_logging()
 
-    # Load configuration from environment with lab-appropriate defaults
-    FTP_USER = os.getenv('FTP_USER', 'labuser')
-    FTP_PASSWORD = os.getenv('FTP_PASSWORD', 'labpass123')
-    FTP_HOST = os.getenv('FTP_HOST', '127.0.0.1')
-    # Non-standard port for lab isolation
-    FTP_PORT = int(os.getenv('FTP_PORT', '2121'))
-    FTP_SERVER_ROOT = os.getenv('FTP_SERVER_ROOT', 'ftp_server_root')
-    # Permission string: e=change dir, l=list, r=read, a=append, d=delete, f=rename, m=mkdir, w=write, M=chmod, T=time
-    FTP_PERMISSIONS = os.getenv('FTP_PERMISSIONS', 'elradfmwMT')
+    # Resolve configuration against the environment in one pass
+    config = ServerConfig.from_env()
+    FTP_USER = config.user
+    FTP_PASSWORD = config.password
+    FTP_HOST = config.host
+    FTP_PORT = config.port
+    FTP_SERVER_ROOT = config.server_root
+    FTP_PERMISSIONS = config.permissions
 
     print("="*60)
     print("           FTP SERVER - CYBERSECURITY LAB")
@@ -211,6 +445,9 @@ def main():
     print(f"Log File: {log_file}")
     print("="*60)
 
+    # Give the server fd headroom for concurrent sessions
+    raise_fd_limit()
+
     # Initialize server directory structure
     server_root_path = create_server_directory(FTP_SERVER_ROOT)
 
@@ -227,32 +464,56 @@ def main():
     handler = CustomFTPHandler
     handler.authorizer = authorizer
 
+    # Zero-copy downloads: serve RETR with sendfile(2) so file bytes go
+    # disk-to-socket in the kernel instead of through userspace read/send
+    # loops (pyftpdlib skips it automatically for ASCII-mode transfers)
+    handler.use_sendfile = hasattr(os, 'sendfile')
+
     # Configure handler security and connection settings
     handler.banner = "FTP Server ready for cybersecurity analysis."
     handler.max_login_attempts = 3  # Prevent brute force attacks
     # Allow data connections from different IPs (for NAT scenarios)
     handler.permit_foreign_addresses = True
-    # High port range for passive data connections
-    handler.passive_ports = range(60000, 65535)
+    # Log and report raw peer IPs only; no masquerading and no hostname
+    # lookups, so connection handling never blocks on DNS
+    handler.masquerade_address = None
+    # MDTM/LIST timestamps in local time, matching the log timestamps
+    handler.use_gmt_times = False
+    # High port range for passive data connections; pre-shuffled list so
+    # successive PASV picks spread across the range instead of scanning
+    # linearly from the bottom. 512 ports is 2x max_cons, plenty even
+    # with every session holding a data connection, and keeps per-PASV
+    # bookkeeping small
+    passive_ports = list(range(60000, 60512))
+    random.shuffle(passive_ports)
+    handler.passive_ports = passive_ports
+
+    # Fan connections out across worker threads instead of a single
+    # event loop so one busy transfer can't starve every other client.
+    # MultiprocessFTPServer would fork per connection, and the handler
+    # hooks log through a thread-based queue that forked children have
+    # no listener to drain, so threads it is.
+    server_class = ThreadedFTPServer
 
     # Create and configure FTP server instance
     try:
-        server = FTPServer((FTP_HOST, FTP_PORT), handler)
+        server = server_class((FTP_HOST, FTP_PORT), handler)
 
         # Server connection limits for resource management
         server.max_cons = 256  # Maximum concurrent connections
         server.max_cons_per_ip = 5  # Per-IP connection limit to prevent abuse
 
-        print(
-            f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Starting FTP server...")
+        print(f"\n[{now_str()}] Starting FTP server...")
         print(f"Server listening on {FTP_HOST}:{FTP_PORT}")
         print("Press Ctrl+C to stop the server")
         print("\nWARNING: This server transmits data unencrypted for lab purposes!")
         print("Monitor traffic with Wireshark on port", FTP_PORT)
         print("-"*60)
 
-        # Start the server (blocks until interrupted)
-        server.serve_forever()
+        # Start the server (blocks until interrupted). The 1 s poll
+        # timeout keeps idle CPU near zero; epoll/kqueue still wakes the
+        # loop immediately when a real event arrives.
+        server.serve_forever(timeout=1.0, blocking=True)
 
     except PermissionError:
         # Common issue when trying to bind to privileged ports (<1024)
@@ -266,8 +527,7 @@ def main():
         sys.exit(1)
     except KeyboardInterrupt:
         # Graceful shutdown on Ctrl+C
-        print(
-            f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Server shutdown requested...")
+        print(f"\n[{now_str()}] Server shutdown requested...")
         server.close_all()  # Close all client connections
         print("FTP Server stopped.")
 
@@ -4,14 +4,102 @@ FTP Test Data Generator - Refactored Version
 Creates demo files for FTP server and client testing
 """
 
+import io
 import os
+import sys
 import json
-import csv
+import tarfile
 import argparse
 from datetime import datetime, timedelta
 import random
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List, Dict, Any, Callable
+from typing import Dict, Any, Callable, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Vectorized generation falls back to the random module
+
+# One PCG64 generator shared by all vectorized draws; constructing a
+# Generator per call would re-seed from the OS each time
+_RNG = np.random.default_rng() if np is not None else None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # JSON rendering falls back to the stdlib encoder
+
+# Frozen sample-data constants; tuples so the generators never rebuild
+# them per call
+PRODUCTS = ("Widget A", "Widget B", "Gadget X", "Tool Pro")
+SALESPEOPLE = ("John Doe", "Jane Smith", "Mike Johnson")
+LOG_LEVELS = ("INFO", "WARNING", "ERROR")
+LOG_COMPONENTS = ("Database", "WebServer", "Auth")
+LOG_MESSAGES = {
+    "INFO": "{}: Service started",
+    "WARNING": "{}: High memory usage",
+    "ERROR": "{}: Connection failed"
+}
+
+# The employee table is fixed and none of its fields need quoting, so
+# the whole CSV payload is rendered once at import time
+EMPLOYEE_CSV = '\r\n'.join(','.join(row) for row in (
+    ("ID", "Name", "Department", "Email", "Salary", "Hire_Date"),
+    ("001", "Alice Johnson", "Engineering",
+     "alice.johnson@company.com", "75000", "2022-03-15"),
+    ("002", "Bob Smith", "Marketing",
+     "bob.smith@company.com", "65000", "2021-08-22"),
+    ("003", "Carol Williams", "HR",
+     "carol.williams@company.com", "58000", "2020-11-10"),
+    ("004", "David Brown", "Engineering",
+     "david.brown@company.com", "82000", "2019-05-18"),
+    ("005", "Eva Davis", "Sales",
+     "eva.davis@company.com", "72000", "2023-01-09"),
+)).encode('utf-8') + b'\r\n'
+
+# README content is static apart from the generation timestamp, so the
+# surrounding text is encoded once and the timestamp spliced in per call
+README_HEAD = b"""FTP Test Data Documentation
+===========================
+
+Generated: """
+README_TAIL = b"""
+
+Files included:
+- employee_records.csv: Employee data
+- app_config.json: App configuration
+- sales_data.csv: Sales transactions
+- system.log: System logs
+- network_config.ini: Network settings
+
+Usage:
+1. Upload files to FTP server
+2. Test download functionality
+3. Verify file integrity
+4. Clean up after testing
+
+Note: All data is fictional for testing only.
+"""
+
+# The INI content never varies, so it is a ready-to-write constant
+NETWORK_CONFIG_INI = b"""[NETWORK]
+interface=eth0
+ip_address=192.168.1.100
+gateway=192.168.1.1
+dns=8.8.8.8
+
+[FTP]
+port=21
+passive_mode=true
+max_connections=50
+timeout=300
+
+[SECURITY]
+firewall_enabled=true
+anonymous_access=false
+max_attempts=3
+"""
 
 
 @dataclass
@@ -57,58 +145,55 @@ class FTPTestDataGenerator:
             print(f"Error creating directory: {e}")
             return False
 
-    def _write_csv(self, filename: str, data: List[List[str]]) -> bool:
-        """Helper to write CSV data"""
-
-        try:
-            with open(filename, 'w', newline='', encoding='utf-8') as f:
-                csv.writer(f).writerows(data)
-            return True
-        except Exception as e:
-            print(f"Error writing CSV {filename}: {e}")
-            return False
-
-    def _write_json(self, filename: str, data: Dict[str, Any]) -> bool:
-        """Helper to write JSON data"""
+    @staticmethod
+    def _render_json(data: Dict[str, Any]) -> bytes:
+        """Helper to render a dict as JSON bytes
+
+        Pretty-printed stdlib json uses the pure-Python encoder; orjson
+        serializes natively and returns bytes in one shot, so prefer it
+        when installed.
+        """
+
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        return json.dumps(data, indent=2).encode('utf-8')
+
+    @staticmethod
+    def _write_all(fd: int, parts: Tuple[bytes, ...]) -> None:
+        """Write every byte of a scatter list to a file descriptor
+
+        os.writev/os.write may return short on signals or a full disk,
+        so keep resubmitting the unwritten tail until the payload is
+        fully on disk.
+        """
+
+        pending = [memoryview(part) for part in parts if part]
+        if hasattr(os, 'writev'):
+            while pending:
+                written = os.writev(fd, pending)
+                while pending and written >= len(pending[0]):
+                    written -= len(pending[0])
+                    pending.pop(0)
+                if written:
+                    pending[0] = pending[0][written:]
+            return
 
-        try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-            return True
-        except Exception as e:
-            print(f"Error writing JSON {filename}: {e}")
-            return False
+        for view in pending:
+            while view:
+                view = view[os.write(fd, view):]
 
-    def _write_text(self, filename: str, content: str) -> bool:
-        """Helper to write text content"""
+    @staticmethod
+    def _render_text(content: str) -> bytes:
+        """Helper to render text content as bytes"""
 
-        try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(content)
-            return True
-        except Exception as e:
-            print(f"Error writing text {filename}: {e}")
-            return False
+        return content.encode('utf-8')
 
-    def _generate_employee_csv(self, filepath: str) -> bool:
+    def _generate_employee_csv(self) -> bytes:
         """Generate employee records CSV"""
 
-        employees = [
-            ["ID", "Name", "Department", "Email", "Salary", "Hire_Date"],
-            ["001", "Alice Johnson", "Engineering",
-                "alice.johnson@company.com", "75000", "2022-03-15"],
-            ["002", "Bob Smith", "Marketing",
-                "bob.smith@company.com", "65000", "2021-08-22"],
-            ["003", "Carol Williams", "HR",
-                "carol.williams@company.com", "58000", "2020-11-10"],
-            ["004", "David Brown", "Engineering",
-                "david.brown@company.com", "82000", "2019-05-18"],
-            ["005", "Eva Davis", "Sales",
-                "eva.davis@company.com", "72000", "2023-01-09"],
-        ]
-        return self._write_csv(filepath, employees)
+        return EMPLOYEE_CSV
 
-    def _generate_config_json(self, filepath: str) -> bool:
+    def _generate_config_json(self) -> bytes:
         """Generate application configuration JSON"""
 
         config = {
@@ -117,143 +202,191 @@ class FTPTestDataGenerator:
             "server": {"host": "0.0.0.0", "port": 8080, "ssl": False},
             "features": {"auth": True, "upload": True, "analytics": True}
         }
-        return self._write_json(filepath, config)
+        return self._render_json(config)
 
-    def _generate_sales_csv(self, filepath: str) -> bool:
+    def _generate_sales_csv(self) -> bytes:
         """Generate sales data CSV"""
 
-        sales_data = [["Date", "Product", "Quantity",
-                       "Price", "Total", "Salesperson"]]
-
-        products = ["Widget A", "Widget B", "Gadget X", "Tool Pro"]
-        salespeople = ["John Doe", "Jane Smith", "Mike Johnson"]
         base_date = datetime.now() - timedelta(days=30)
-
-        for day in range(30):
-            date = (base_date + timedelta(days=day)).strftime("%Y-%m-%d")
-            for _ in range(random.randint(1, 3)):
-                quantity = random.randint(1, 5)
-                price = round(random.uniform(20, 200), 2)
-                sales_data.append([
-                    date, random.choice(products), quantity, price,
-                    round(quantity * price, 2), random.choice(salespeople)
-                ])
-
-        return self._write_csv(filepath, sales_data)
-
-    def _generate_system_log(self, filepath: str) -> bool:
+        day_strs = [(base_date + timedelta(days=day)).strftime("%Y-%m-%d")
+                    for day in range(30)]
+
+        if np is not None:
+            # Draw every random column in one vectorized pass instead of
+            # three interpreter-level random calls per row
+            counts = _RNG.integers(1, 4, size=30)
+            total = int(counts.sum())
+            dates = np.repeat(day_strs, counts)
+            products = _RNG.choice(PRODUCTS, size=total)
+            quantities = _RNG.integers(1, 6, size=total)
+            prices = _RNG.uniform(20, 200, size=total).round(2)
+            salespeople = _RNG.choice(SALESPEOPLE, size=total)
+        else:
+            # Mirror the numpy branch: draw each column in one batched
+            # call instead of three random.choice dispatches per row
+            counts = random.choices((1, 2, 3), k=30)
+            total = sum(counts)
+            dates = [day_strs[day]
+                     for day, n in enumerate(counts) for _ in range(n)]
+            products = random.choices(PRODUCTS, k=total)
+            quantities = random.choices((1, 2, 3, 4, 5), k=total)
+            prices = [round(random.uniform(20, 200), 2) for _ in range(total)]
+            salespeople = random.choices(SALESPEOPLE, k=total)
+
+        # No field ever contains a comma or quote, so the csv module's
+        # quoting machinery is skipped in favor of plain f-string rows
+        lines = ["Date,Product,Quantity,Price,Total,Salesperson"]
+        lines.extend(
+            f"{date},{product},{quantity},{price:.2f},{quantity * price:.2f},{person}"
+            for date, product, quantity, price, person
+            in zip(dates, products, quantities, prices, salespeople))
+
+        return self._render_text('\n'.join(lines) + '\n')
+
+    def _generate_system_log(self) -> bytes:
         """Generate system log file"""
 
-        log_entries = []
-        levels = ["INFO", "WARNING", "ERROR"]
-        components = ["Database", "WebServer", "Auth"]
-
         base_time = datetime.now() - timedelta(hours=24)
 
-        for i in range(20):
-            timestamp = base_time + timedelta(minutes=random.randint(0, 1440))
-            level = random.choice(levels)
-            component = random.choice(components)
-
-            messages = {
-                "INFO": f"{component}: Service started",
-                "WARNING": f"{component}: High memory usage",
-                "ERROR": f"{component}: Connection failed"
-            }
-
-            entry = f"[{timestamp.strftime('%Y-%m-%d %H:%M:%S')}] [{level}] {messages[level]}\n"
-            log_entries.append(entry)
-
-        return self._write_text(filepath, ''.join(sorted(log_entries)))
-
-    def _generate_readme(self, filepath: str) -> bool:
-        """Generate project documentation"""
-
-        content = f"""FTP Test Data Documentation
-===========================
-
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-Files included:
-- employee_records.csv: Employee data
-- app_config.json: App configuration  
-- sales_data.csv: Sales transactions
-- system.log: System logs
-- network_config.ini: Network settings
-
-Usage:
-1. Upload files to FTP server
-2. Test download functionality
-3. Verify file integrity
-4. Clean up after testing
-
-Note: All data is fictional for testing only.
-"""
-        return self._write_text(filepath, content)
+        # Sorting the integer minute offsets up front yields entries in
+        # chronological order directly, replacing the old string sort
+        # over fully rendered lines
+        if np is not None:
+            offsets = np.sort(_RNG.integers(0, 1441, size=20))
+            level_picks = _RNG.choice(LOG_LEVELS, size=20)
+            comp_picks = _RNG.choice(LOG_COMPONENTS, size=20)
+        else:
+            offsets = sorted(random.choices(range(1441), k=20))
+            level_picks = random.choices(LOG_LEVELS, k=20)
+            comp_picks = random.choices(LOG_COMPONENTS, k=20)
 
-    def _generate_network_config(self, filepath: str) -> bool:
+        # The offsets are sorted, so duplicates are adjacent and each
+        # unique minute is strftime'd exactly once
+        log_entries = []
+        last_minute = None
+        timestamp = ''
+        for minutes, level, component in zip(offsets, level_picks, comp_picks):
+            minutes = int(minutes)
+            if minutes != last_minute:
+                timestamp = (base_time + timedelta(minutes=minutes)
+                             ).strftime('%Y-%m-%d %H:%M:%S')
+                last_minute = minutes
+            log_entries.append(
+                f"[{timestamp}] [{level}] {LOG_MESSAGES[level].format(component)}\n")
+
+        return self._render_text(''.join(log_entries))
+
+    def _generate_readme(self) -> Tuple[bytes, ...]:
+        """Generate project documentation
+
+        Returns the payload as separate parts so generate_file can hand
+        them to writev without joining them first.
+        """
+
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return (README_HEAD, timestamp.encode('utf-8'), README_TAIL)
+
+    def _generate_network_config(self) -> bytes:
         """Generate network configuration INI"""
-        content = """[NETWORK]
-interface=eth0
-ip_address=192.168.1.100
-gateway=192.168.1.1
-dns=8.8.8.8
 
-[FTP]
-port=21
-passive_mode=true
-max_connections=50
-timeout=300
+        return NETWORK_CONFIG_INI
 
-[SECURITY]
-firewall_enabled=true
-anonymous_access=false
-max_attempts=3
-"""
-        return self._write_text(filepath, content)
+    def generate_file(self, generator: FileGenerator) -> Tuple[bool, str]:
+        """Render and write a single file
 
-    def generate_file(self, generator: FileGenerator) -> bool:
-        """Generate a single file"""
+        Returns a (success, status message) pair; the caller batches the
+        messages into one stdout write instead of printing per file.
+        """
 
         filepath = os.path.join(self.output_dir, generator.filename)
-        if generator.generator_func(filepath):
-            size = os.path.getsize(filepath)
-            size_str = f"{size} bytes" if size < 1024 else f"{size/1024:.1f} KB"
-            print(f"✅ {generator.name}: {generator.filename} ({size_str})")
-            return True
-        else:
-            print(f"❌ Failed: {generator.name}")
-            return False
+        try:
+            data = generator.generator_func()
+            # Generators may return one buffer or a sequence of parts;
+            # writev hands the kernel the scatter list without a join
+            parts = (data,) if isinstance(data, bytes) else tuple(data)
+            fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                self._write_all(fd, parts)
+            finally:
+                os.close(fd)
+        except Exception as e:
+            return False, f"❌ Failed: {generator.name} ({e})"
+
+        # Size comes from the rendered buffers; no stat syscall needed
+        size = sum(len(part) for part in parts)
+        size_str = f"{size} bytes" if size < 1024 else f"{size/1024:.1f} KB"
+        return True, f"✅ {generator.name}: {generator.filename} ({size_str})"
 
     def generate_all(self) -> None:
         """Generate all test files"""
 
-        print("FTP Test Data Generator")
-        print("=" * 40)
-
         if not self.create_output_directory():
             print("Failed to create output directory")
             return
 
-        print(f"Generating files in: {self.output_dir}")
-        print("-" * 40)
+        # Generate files concurrently; the write() calls release the GIL
+        # so the per-file disk latencies overlap. success_count is
+        # computed from the results afterwards to avoid shared-state
+        # updates across threads.
+        with ThreadPoolExecutor(max_workers=len(self.generators)) as executor:
+            results = list(executor.map(self.generate_file, self.generators))
+        self.success_count = sum(success for success, _ in results)
+
+        # One stdout write for banner plus statuses instead of ~10
+        # print calls
+        lines = ["FTP Test Data Generator", "=" * 40,
+                 f"Generating files in: {self.output_dir}", "-" * 40]
+        lines.extend(message for _, message in results)
+        sys.stdout.write('\n'.join(lines) + '\n')
 
-        for generator in self.generators:
-            if self.generate_file(generator):
+        self.print_summary()
+
+    def generate_archive(self) -> None:
+        """Bundle all test files into a single tar.gz archive
+
+        One sequential compressed write replaces six small file
+        creations; handy when the caller only wants a test-data bundle
+        to upload.
+        """
+
+        archive_path = f"{self.output_dir}.tar.gz"
+
+        lines = ["FTP Test Data Generator", "=" * 40,
+                 f"Generating archive: {archive_path}", "-" * 40]
+
+        with tarfile.open(archive_path, 'w:gz') as tar:
+            for generator in self.generators:
+                try:
+                    data = generator.generator_func()
+                    if not isinstance(data, bytes):
+                        data = b''.join(data)
+                except Exception as e:
+                    lines.append(f"❌ Failed: {generator.name} ({e})")
+                    continue
+
+                info = tarfile.TarInfo(generator.filename)
+                info.size = len(data)
+                info.mtime = int(datetime.now().timestamp())
+                tar.addfile(info, io.BytesIO(data))
                 self.success_count += 1
+                lines.append(
+                    f"✅ {generator.name}: {generator.filename} ({len(data)} bytes)")
 
+        sys.stdout.write('\n'.join(lines) + '\n')
         self.print_summary()
 
     def print_summary(self) -> None:
         """Print generation summary"""
 
         total_files = len(self.generators)
-        print(f"\nSummary: {self.success_count}/{total_files} files created")
+        summary = f"\nSummary: {self.success_count}/{total_files} files created\n"
 
         if self.success_count == total_files:
-            print("🎉 All files generated successfully!")
+            summary += "🎉 All files generated successfully!\n"
         else:
-            print(f"⚠️  {total_files - self.success_count} files failed")
+            summary += f"⚠️  {total_files - self.success_count} files failed\n"
+
+        sys.stdout.write(summary)
 
 
 def main():
@@ -262,10 +395,15 @@ def main():
     parser = argparse.ArgumentParser(description='Generate FTP test data')
     parser.add_argument('--dir', default='ftp_test_data',
                         help='Output directory (default: ftp_test_data)')
+    parser.add_argument('--archive', action='store_true',
+                        help='Write a single <dir>.tar.gz bundle instead of individual files')
     args = parser.parse_args()
 
     generator = FTPTestDataGenerator(args.dir)
-    generator.generate_all()
+    if args.archive:
+        generator.generate_archive()
+    else:
+        generator.generate_all()
 
 
 if __name__ == "__main__":